@@ -1,3 +1,5 @@
+import secrets
+from fastapi import Header, HTTPException
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -15,3 +17,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def require_admin(x_admin_token: str = Header(default="")):
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_TOKEN not set)")
+    if not secrets.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, PlainTextResponse
+from typing import List, Optional
+from app.api.dependencies import require_admin, get_db
+from app.schemas.admin_schema import ProfileRuleRequest, ProfileRuleResponse, ProfileResponse, ProfileRerunResponse
+from app.models.base import Task, ArchivedTask
+from app.services.task_manager import create_task, run_download_task
+from app.services import profiler
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.post("/profiling/rules", response_model=ProfileRuleResponse)
+def create_profile_rule(req: ProfileRuleRequest):
+    return profiler.add_rule(req.task_id, req.platform, req.duration_seconds, req.max_runs)
+
+
+@router.post("/profiling/tasks/{task_id}/rerun", response_model=ProfileRerunResponse)
+def rerun_task_profiled(task_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Queue a new download of an existing (or archived) task's URL with profiling enabled for it."""
+    source = db.query(Task).filter(Task.id == task_id).first() or \
+        db.query(ArchivedTask).filter(ArchivedTask.id == task_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    new_task = create_task(db, source.url, source.format_id)
+    rule = profiler.add_rule(task_id=new_task.id, max_runs=1)
+    background_tasks.add_task(run_download_task, new_task.id, new_task.url)
+
+    return ProfileRerunResponse(task_id=new_task.id, status=new_task.status, rule=rule)
+
+
+@router.get("/profiling/rules", response_model=List[ProfileRuleResponse])
+def get_profile_rules():
+    return profiler.list_rules()
+
+
+@router.delete("/profiling/rules/{rule_id}")
+def delete_profile_rule(rule_id: str):
+    if not profiler.remove_rule(rule_id):
+        raise HTTPException(status_code=404, detail="Rule not found")
+    return {"deleted": rule_id}
+
+
+@router.get("/profiling/profiles", response_model=List[ProfileResponse])
+def get_profiles(task_id: Optional[str] = None):
+    return profiler.list_profiles(task_id)
+
+
+@router.get("/profiling/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed(profile_id: str):
+    """Collapsed stacks ("frame;frame;frame count" per line), ready for flamegraph.pl / speedscope."""
+    path = profiler.get_profile_path(profile_id, "collapsed")
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@router.get("/profiling/profiles/{profile_id}/pstats")
+def get_profile_pstats(profile_id: str):
+    """Raw cProfile output, loadable with pstats / snakeviz."""
+    path = profiler.get_profile_path(profile_id, "pstats")
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
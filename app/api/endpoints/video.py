@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import os
-import uuid
 from app.api.dependencies import get_db
-from app.schemas.video_schema import ParseRequest, ParseResponse, DownloadRequest, DownloadResponse, TaskResponse
+from app.schemas.video_schema import ParseRequest, ParseResponse, DownloadRequest, BatchDownloadRequest, DownloadResponse, TaskResponse, ArchivedTaskResponse
 from app.services.downloader import parse_video
-from app.models.base import Task, TaskStatus
-from app.services.task_manager import process_download_task
+from app.models.base import Task, ArchivedTask
+from app.services.task_manager import run_download_task, create_task
+from app.services.platforms import PLATFORM_DOMAINS
 from app.core.config import settings
 
 router = APIRouter()
 
 
+def _local_url(local_path: Optional[str]) -> Optional[str]:
+    if not local_path:
+        return None
+    return f"/downloads/{os.path.relpath(local_path, settings.TEMP_DOWNLOAD_DIR)}"
+
+
 @router.post("/parse", response_model=ParseResponse)
 def parse_video_url(req: ParseRequest, db: Session = Depends(get_db)):
     try:
@@ -33,21 +39,34 @@ async def download_video_url(
     except Exception as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    fid = req.format_id if req.format_id else "best"
+    new_task = create_task(db, req.url, req.format_id)
+    background_tasks.add_task(run_download_task, new_task.id, new_task.url)
+
+    return DownloadResponse(task_id=new_task.id, status=new_task.status)
+
+
+@router.post("/download/batch", response_model=List[DownloadResponse])
+def download_video_batch(
+    req: BatchDownloadRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    if not req.urls:
+        raise HTTPException(status_code=422, detail="No valid URLs supplied")
 
-    new_task = Task(
-        id=str(uuid.uuid4()),
-        url=req.url,
-        format_id=fid,
-        status=TaskStatus.PENDING
-    )
-    db.add(new_task)
+    tasks = [create_task(db, url, req.format_id, commit=False) for url in req.urls]
     db.commit()
-    db.refresh(new_task)
 
-    background_tasks.add_task(process_download_task, new_task.id)
+    for t in tasks:
+        background_tasks.add_task(run_download_task, t.id, t.url)
+
+    return [DownloadResponse(task_id=t.id, status=t.status) for t in tasks]
 
-    return DownloadResponse(task_id=new_task.id, status=new_task.status)
+
+@router.get("/platforms")
+def get_platforms():
+    """Domain -> platform mapping used to pick supported links (e.g. by clients/pc_watcher.py)."""
+    return PLATFORM_DOMAINS
 
 
 @router.get("/tasks", response_model=List[TaskResponse])
@@ -62,7 +81,37 @@ def get_tasks(db: Session = Depends(get_db)):
             "format_id": t.format_id,
             "error_msg": t.error_msg,
             "created_at": t.created_at.isoformat() if t.created_at else "",
-            "local_url": f"/downloads/{os.path.relpath(t.local_path, settings.TEMP_DOWNLOAD_DIR)}" if t.local_path else None,
+            "local_url": _local_url(t.local_path),
+        }
+        for t in tasks
+    ]
+
+
+@router.get("/tasks/archive", response_model=List[ArchivedTaskResponse])
+def get_archived_tasks(
+    status: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db)
+):
+    query = db.query(ArchivedTask)
+    if status:
+        query = query.filter(ArchivedTask.status == status.upper())
+    tasks = query.order_by(ArchivedTask.created_at.desc()).offset(offset).limit(limit).all()
+    return [
+        {
+            "id": t.id,
+            "url": t.url,
+            "title": t.title,
+            "status": t.status,
+            "format_id": t.format_id,
+            "format_note": t.format_note,
+            "error_msg": t.error_msg,
+            "thumbnail": t.thumbnail,
+            "created_at": t.created_at.isoformat() if t.created_at else "",
+            "finished_at": t.finished_at.isoformat() if t.finished_at else None,
+            "archived_at": t.archived_at.isoformat() if t.archived_at else None,
+            "local_url": _local_url(t.local_path),
         }
         for t in tasks
     ]
@@ -19,6 +19,32 @@ class Settings(BaseSettings):
         env="CORS_ORIGINS"
     )
 
+    # Finished (COMPLETED/FAILED) tasks older than this are moved to tasks_archive
+    ARCHIVE_AFTER_DAYS: int = Field(default=30, env="ARCHIVE_AFTER_DAYS")
+
+    # How often to run archival + VACUUM/ANALYZE maintenance (0 disables it)
+    DB_MAINTENANCE_INTERVAL_HOURS: int = Field(default=24, env="DB_MAINTENANCE_INTERVAL_HOURS")
+
+    # One-time full VACUUM to switch an existing SQLite file to incremental vacuum.
+    # Locks the database while it runs, so enable it during a quiet period.
+    DB_VACUUM_CONVERT: bool = Field(default=False, env="DB_VACUUM_CONVERT")
+
+    # Token required in the X-Admin-Token header for /admin endpoints (empty disables them)
+    ADMIN_TOKEN: str = Field(default="", env="ADMIN_TOKEN")
+
+    # Directory where profiling output (pstats / collapsed stacks) is stored
+    PROFILE_DIR: str = Field(default="./profiles", env="PROFILE_DIR")
+
+    # Stack sampling interval used while a profile is being recorded
+    PROFILE_SAMPLE_INTERVAL_MS: int = Field(default=5, env="PROFILE_SAMPLE_INTERVAL_MS")
+
+    # Limits for a profiling rule that does not set its own duration_seconds / max_runs
+    PROFILE_RULE_DEFAULT_SECONDS: int = Field(default=3600, env="PROFILE_RULE_DEFAULT_SECONDS")
+    PROFILE_RULE_DEFAULT_RUNS: int = Field(default=10, env="PROFILE_RULE_DEFAULT_RUNS")
+
+    # Only the newest N profiles are kept in PROFILE_DIR
+    PROFILE_MAX_STORED: int = Field(default=50, env="PROFILE_MAX_STORED")
+
     class Config:
         env_file = ".env"
 
@@ -1,17 +1,24 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from app.api.endpoints import video
+from app.api.endpoints import video, admin
 from app.models.base import Base
 from app.api.dependencies import engine
 from app.core.config import settings
 from fastapi.middleware.cors import CORSMiddleware
+from app.services.archiver import start_maintenance_scheduler
 import os
 
 from sqlalchemy import text
 from app.api.dependencies import engine
 
 # Create the database tables if they do not exist
-Base.metadata.create_all(bind=engine)
+with engine.begin() as conn:
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # auto_vacuum can only be chosen before the first table is created;
+        # existing files are converted by the maintenance job (DB_VACUUM_CONVERT)
+        if conn.execute(text("SELECT count(*) FROM sqlite_master")).scalar() == 0:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+    Base.metadata.create_all(bind=conn)
 
 # Auto-migration for SQLite to inject new columns
 with engine.begin() as conn:
@@ -37,9 +44,18 @@ with engine.begin() as conn:
         try:
             conn.execute(text("ALTER TABLE tasks ADD COLUMN format_note VARCHAR;"))
         except Exception: pass
+        try:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tasks_created_at ON tasks (created_at);"))
+        except Exception: pass
 
 app = FastAPI(title="Accio-Downloader")
 
+
+@app.on_event("startup")
+def start_background_maintenance():
+    start_maintenance_scheduler()
+
+
 # Load CORS origins from env (comma-separated)
 cors_origins = [o.strip() for o in settings.CORS_ORIGINS.split(",") if o.strip()]
 
@@ -52,6 +68,7 @@ app.add_middleware(
 )
 
 app.include_router(video.router, prefix="/api/v1/video", tags=["Video"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 # Mount downloads directory for local file access
 os.makedirs(settings.TEMP_DOWNLOAD_DIR, exist_ok=True)
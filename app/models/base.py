@@ -32,5 +32,27 @@ class Task(Base):
     eta_str = Column(String, nullable=True)
     format_note = Column(String, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ArchivedTask(Base):
+    """
+    Compact copy of a finished task. Progress columns (percent, bytes,
+    speed, eta) are dropped since they are meaningless once a task is done.
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(String, primary_key=True)
+    url = Column(String)
+    title = Column(String, nullable=True)
+    status = Column(String)
+    format_id = Column(String, nullable=True)
+    format_note = Column(String, nullable=True)
+    local_path = Column(String, nullable=True)
+    error_msg = Column(String, nullable=True)
+    thumbnail = Column(String, nullable=True)
+
+    created_at = Column(DateTime, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ProfileRuleRequest(BaseModel):
+    # task ids are only known once a task exists, see POST /profiling/tasks/{task_id}/rerun
+    task_id: Optional[str] = None
+    platform: Optional[str] = None  # e.g. "bilibili", see detect_platform
+    duration_seconds: Optional[int] = Field(default=None, gt=0)
+    max_runs: Optional[int] = Field(default=None, gt=0)
+
+class ProfileRuleResponse(BaseModel):
+    id: str
+    task_id: Optional[str] = None
+    platform: Optional[str] = None
+    until: float
+    max_runs: int
+    runs: int
+
+class ProfileResponse(BaseModel):
+    id: str
+    section: str
+    task_id: Optional[str] = None
+    url: Optional[str] = None
+    rule_id: str
+    started_at: str
+    duration_seconds: float
+    samples: int
+    has_pstats: bool
+
+class ProfileRerunResponse(BaseModel):
+    task_id: str
+    status: str
+    rule: ProfileRuleResponse
@@ -29,6 +29,25 @@ class DownloadRequest(BaseModel):
             return match.group(1)
         return raw_str
 
+# Upper bound on URLs per /download/batch request
+MAX_BATCH_URLS = 20
+
+class BatchDownloadRequest(BaseModel):
+    urls: List[str]
+    format_id: Optional[str] = "best"
+
+    @validator('urls', pre=True)
+    def extract_urls(cls, v):
+        items = v if isinstance(v, list) else [v]
+        urls = []
+        for item in items:
+            match = re.search(r'(https?://[^\s]+)', str(item))
+            if match and match.group(1) not in urls:
+                urls.append(match.group(1))
+        if len(urls) > MAX_BATCH_URLS:
+            raise ValueError(f"At most {MAX_BATCH_URLS} URLs per batch")
+        return urls
+
 class DownloadResponse(BaseModel):
     task_id: str
     status: str
@@ -53,3 +72,20 @@ class TaskResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ArchivedTaskResponse(BaseModel):
+    id: str
+    url: str
+    title: Optional[str] = None
+    status: str
+    format_id: Optional[str] = None
+    format_note: Optional[str] = None
+    error_msg: Optional[str] = None
+    thumbnail: Optional[str] = None
+    created_at: str
+    finished_at: Optional[str] = None
+    archived_at: Optional[str] = None
+    local_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
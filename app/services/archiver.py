@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import text, select, insert, delete, literal
+from sqlalchemy.orm import Session
+from app.api.dependencies import SessionLocal, engine
+from app.models.base import Task, TaskStatus, ArchivedTask
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows moved per transaction, keeps the write lock short so running
+# downloads can still commit their progress updates in between.
+ARCHIVE_BATCH_SIZE = 500
+
+# Free pages reclaimed per maintenance run (4 KiB pages -> ~40 MiB)
+INCREMENTAL_VACUUM_PAGES = 10000
+
+# Delay before the first maintenance run, so it never races app startup
+MAINTENANCE_STARTUP_DELAY = 600
+
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+
+def archive_old_tasks(db: Session, older_than_days: Optional[int] = None) -> int:
+    """
+    Move COMPLETED/FAILED tasks created before the cutoff into tasks_archive.
+    Returns the number of archived tasks.
+    """
+    days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    archived = 0
+
+    while True:
+        ids = db.execute(
+            select(Task.id)
+            .where(Task.status.in_(FINISHED_STATUSES), Task.created_at < cutoff)
+            .order_by(Task.created_at)
+            .limit(ARCHIVE_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+
+        try:
+            db.execute(
+                insert(ArchivedTask).from_select(
+                    [
+                        ArchivedTask.id, ArchivedTask.url, ArchivedTask.title, ArchivedTask.status,
+                        ArchivedTask.format_id, ArchivedTask.format_note, ArchivedTask.local_path,
+                        ArchivedTask.error_msg, ArchivedTask.thumbnail, ArchivedTask.created_at,
+                        ArchivedTask.finished_at, ArchivedTask.archived_at,
+                    ],
+                    select(
+                        Task.id, Task.url, Task.title, Task.status,
+                        Task.format_id, Task.format_note, Task.local_path,
+                        Task.error_msg, Task.thumbnail, Task.created_at,
+                        Task.updated_at, literal(datetime.utcnow()),
+                    ).where(Task.id.in_(ids)),
+                )
+            )
+            db.execute(delete(Task).where(Task.id.in_(ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        archived += len(ids)
+        if len(ids) < ARCHIVE_BATCH_SIZE:
+            break
+
+    return archived
+
+
+def optimize_sqlite():
+    """
+    Reclaim free pages and refresh planner statistics.
+    Incremental vacuum only works once the database uses auto_vacuum=INCREMENTAL,
+    which new databases get at creation (see app.main). Converting an existing
+    database needs a full VACUUM, which locks it for the whole run, so that only
+    happens when DB_VACUUM_CONVERT is enabled.
+    """
+    if not settings.DATABASE_URL.startswith("sqlite"):
+        return
+
+    # VACUUM cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode == 2:  # 2 == INCREMENTAL
+            # pysqlite steps a statement without result columns only once (freeing a
+            # single page); executescript runs the pragma to completion.
+            conn.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});")
+        elif settings.DB_VACUUM_CONVERT:
+            logger.info("Converting database to auto_vacuum=INCREMENTAL (full VACUUM)")
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+        else:
+            logger.info("Skipping vacuum: database is not in auto_vacuum=INCREMENTAL mode, set DB_VACUUM_CONVERT=true to convert it")
+        conn.execute(text("ANALYZE"))
+
+
+def run_db_maintenance() -> int:
+    db: Session = SessionLocal()
+    try:
+        archived = archive_old_tasks(db)
+    finally:
+        db.close()
+    optimize_sqlite()
+    return archived
+
+
+def start_maintenance_scheduler():
+    """Run archival + VACUUM/ANALYZE in a daemon thread every DB_MAINTENANCE_INTERVAL_HOURS."""
+    interval = settings.DB_MAINTENANCE_INTERVAL_HOURS * 3600
+    if interval <= 0:
+        return None
+
+    def loop():
+        time.sleep(min(MAINTENANCE_STARTUP_DELAY, interval))
+        while True:
+            try:
+                archived = run_db_maintenance()
+                logger.info("Database maintenance archived %d finished tasks", archived)
+            except Exception:
+                logger.exception("Database maintenance failed")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="db-maintenance", daemon=True)
+    thread.start()
+    return thread
@@ -3,6 +3,7 @@ import tempfile
 import yt_dlp
 from sqlalchemy.orm import Session
 from app.schemas.video_schema import VideoFormat, ParseResponse
+from app.services.profiler import profile
 
 from typing import Optional
 
@@ -32,7 +33,7 @@ def parse_video(url: str, db: Session) -> ParseResponse:
         ydl_opts['cookiefile'] = cookie_file
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with profile("parse", url=url), yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             
             title = info.get('title', 'Unknown Title')
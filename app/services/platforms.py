@@ -0,0 +1,29 @@
+# Domain substring -> display folder name, also served to clients via /video/platforms
+PLATFORM_DOMAINS = {
+    "bilibili.com": "bilibili",
+    "b23.tv": "bilibili",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "tiktok.com": "tiktok",
+    "douyin.com": "douyin",
+    "xiaohongshu.com": "xiaohongshu",
+    "xhslink.com": "xiaohongshu",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "instagram.com": "instagram",
+    "weibo.com": "weibo",
+    "v.qq.com": "tencent-video",
+    "iqiyi.com": "iqiyi",
+    "youku.com": "youku",
+    "twitch.tv": "twitch",
+    "nicovideo.jp": "nicovideo",
+}
+
+
+def detect_platform(url: str) -> str:
+    """Detect the video platform from the URL and return a display folder name."""
+    url_lower = url.lower()
+    for domain, name in PLATFORM_DOMAINS.items():
+        if domain in url_lower:
+            return name
+    return "other"
@@ -0,0 +1,214 @@
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List
+from app.core.config import settings
+from app.services.platforms import detect_platform
+
+logger = logging.getLogger(__name__)
+
+PROFILE_EXTENSIONS = ("json", "pstats", "collapsed")
+
+PROFILE_ID_PATTERN = re.compile(r'^[\w.-]+$')
+
+_rules: List[dict] = []
+_rules_lock = threading.Lock()
+
+
+def add_rule(
+    task_id: Optional[str] = None,
+    platform: Optional[str] = None,
+    duration_seconds: Optional[int] = None,
+    max_runs: Optional[int] = None,
+) -> dict:
+    """
+    Enable profiling for a task id and/or platform (as returned by detect_platform).
+    Empty selectors match anything. The rule expires after duration_seconds or
+    max_runs profiled runs, whichever comes first (defaults from settings).
+    """
+    rule = {
+        "id": uuid.uuid4().hex[:12],
+        "task_id": task_id,
+        "platform": platform.lower() if platform else None,
+        "until": time.time() + (duration_seconds or settings.PROFILE_RULE_DEFAULT_SECONDS),
+        "max_runs": max_runs or settings.PROFILE_RULE_DEFAULT_RUNS,
+        "runs": 0,
+    }
+    with _rules_lock:
+        _rules.append(rule)
+    return rule
+
+
+def list_rules() -> List[dict]:
+    _expire_rules()
+    with _rules_lock:
+        return list(_rules)
+
+
+def remove_rule(rule_id: str) -> bool:
+    with _rules_lock:
+        for rule in _rules:
+            if rule["id"] == rule_id:
+                _rules.remove(rule)
+                return True
+    return False
+
+
+def _expire_rules():
+    now = time.time()
+    with _rules_lock:
+        _rules[:] = [r for r in _rules if r["until"] > now]
+
+
+def _match_rule(task_id: Optional[str], url: Optional[str]) -> Optional[dict]:
+    if not _rules:
+        return None
+    _expire_rules()
+
+    platform = detect_platform(url) if url else None
+    with _rules_lock:
+        for rule in _rules:
+            if rule["task_id"] and rule["task_id"] != task_id:
+                continue
+            if rule["platform"] and rule["platform"] != platform:
+                continue
+            rule["runs"] += 1
+            if rule["runs"] >= rule["max_runs"]:
+                _rules.remove(rule)
+            return rule
+    return None
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, target_thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+@contextmanager
+def profile(section: str, task_id: Optional[str] = None, url: Optional[str] = None):
+    """
+    Profile the enclosed block if an active rule matches the task/url.
+    Writes <id>.pstats, <id>.collapsed and <id>.json to PROFILE_DIR.
+    Costs a single list check when no rules are active.
+    """
+    rule = _match_rule(task_id, url)
+    if rule is None:
+        yield
+        return
+
+    sampler = StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another cProfile session is active (Python 3.12+ allows only one); keep the sampler
+        profiler = None
+
+    started_at = datetime.utcnow()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        if profiler:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        try:
+            _save_profile(section, task_id, url, rule, started_at, elapsed, profiler, sampler)
+            _prune_profiles()
+        except Exception:
+            logger.exception("Failed to save profile")
+
+
+def _save_profile(section, task_id, url, rule, started_at, elapsed, profiler, sampler):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    profile_id = f"{started_at.strftime('%Y%m%d-%H%M%S')}-{section}-{task_id or uuid.uuid4().hex[:8]}"
+    base_path = os.path.join(settings.PROFILE_DIR, profile_id)
+
+    if profiler:
+        profiler.dump_stats(f"{base_path}.pstats")
+    with open(f"{base_path}.collapsed", 'w', encoding='utf-8') as f:
+        f.write(sampler.collapsed())
+
+    meta = {
+        "id": profile_id,
+        "section": section,
+        "task_id": task_id,
+        "url": url,
+        "rule_id": rule["id"],
+        "started_at": started_at.isoformat(),
+        "duration_seconds": round(elapsed, 3),
+        "samples": sum(sampler.counts.values()),
+        "has_pstats": profiler is not None,
+    }
+    with open(f"{base_path}.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def _prune_profiles():
+    """Delete the oldest profiles beyond PROFILE_MAX_STORED."""
+    for meta in list_profiles()[settings.PROFILE_MAX_STORED:]:
+        for ext in PROFILE_EXTENSIONS:
+            path = get_profile_path(meta["id"], ext)
+            if path:
+                os.remove(path)
+
+
+def list_profiles(task_id: Optional[str] = None) -> List[dict]:
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(settings.PROFILE_DIR, name), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if task_id and meta.get("task_id") != task_id:
+            continue
+        profiles.append(meta)
+    return sorted(profiles, key=lambda m: m["started_at"], reverse=True)
+
+
+def get_profile_path(profile_id: str, ext: str) -> Optional[str]:
+    """Return the path of a stored profile artifact, or None if it does not exist."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.{ext}")
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,106 @@
+"""
+Benchmark GET /tasks (get_tasks) and task insert latency on a populated database.
+
+Run from the root of the tree to measure, e.g. against the pre-archival baseline:
+
+    git worktree add /tmp/baseline <commit>
+    (cd /tmp/baseline && python /path/to/bench_tasks.py)
+    python bench_tasks.py --maintenance
+
+The database is a fresh SQLite file created by app.main with the settings as
+shipped, filled with --rows finished tasks spread over the past year.
+--maintenance runs one run_db_maintenance() pass (archival + vacuum + ANALYZE)
+before measuring.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=100_000)
+parser.add_argument("--maintenance", action="store_true")
+args = parser.parse_args()
+
+workdir = tempfile.mkdtemp()
+db_path = os.path.join(workdir, "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+os.environ["TEMP_DOWNLOAD_DIR"] = os.path.join(workdir, "downloads")
+sys.path.insert(0, os.getcwd())
+
+import app.main  # noqa: E402,F401  creates the schema exactly as the app does
+from sqlalchemy import text  # noqa: E402
+from app.api.dependencies import SessionLocal, engine  # noqa: E402
+from app.api.endpoints.video import get_tasks  # noqa: E402
+from app.models.base import Task, TaskStatus  # noqa: E402
+
+try:
+    from app.services.task_manager import create_task
+except ImportError:
+    # Baseline tree: same statements as the original /download handler
+    def create_task(db, url, format_id):
+        task = Task(id=str(uuid.uuid4()), url=url, format_id=format_id or "best", status=TaskStatus.PENDING)
+        db.add(task)
+        db.commit()
+        db.refresh(task)
+        return task
+
+db = SessionLocal()
+start = datetime.utcnow() - timedelta(days=365)
+step = timedelta(days=365) / args.rows
+db.bulk_insert_mappings(Task, [
+    dict(
+        id=str(uuid.uuid4()),
+        url=f"https://www.bilibili.com/video/BV{i}",
+        title="t" * 60,
+        status=TaskStatus.COMPLETED,
+        format_id="best",
+        local_path=os.path.join(os.environ["TEMP_DOWNLOAD_DIR"], "bilibili", "p" * 60 + ".mp4"),
+        thumbnail="https://i0.hdslb.com/" + "x" * 60,
+        percent=100,
+        downloaded_bytes=10**8,
+        total_bytes=10**8,
+        speed_str="5.00 MiB/s",
+        eta_str="00:00",
+        format_note="1080p mp4",
+        created_at=start + step * i,
+        updated_at=start + step * i,
+    )
+    for i in range(args.rows)
+])
+db.commit()
+
+if args.maintenance:
+    from app.services.archiver import run_db_maintenance
+    t = time.perf_counter()
+    archived = run_db_maintenance()
+    print(f"maintenance: archived {archived} rows in {time.perf_counter() - t:.2f}s")
+
+with engine.connect() as conn:
+    plan = conn.execute(text("EXPLAIN QUERY PLAN SELECT * FROM tasks ORDER BY created_at DESC LIMIT 50")).fetchall()
+    auto_vacuum = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+    freelist = conn.execute(text("PRAGMA freelist_count")).scalar()
+print("plan:", "; ".join(row[-1] for row in plan))
+
+get_tasks(db)  # warm the page cache
+n = 50
+t = time.perf_counter()
+for _ in range(n):
+    get_tasks(db)
+tasks_ms = (time.perf_counter() - t) / n * 1000
+
+n = 300
+t = time.perf_counter()
+for _ in range(n):
+    create_task(db, "https://b23.tv/bench", "best")
+insert_ms = (time.perf_counter() - t) / n * 1000
+
+print(
+    f"get_tasks {tasks_ms:.2f} ms, create_task {insert_ms:.2f} ms, "
+    f"live rows {db.query(Task).count()}, file {os.path.getsize(db_path) / 1e6:.1f} MB, "
+    f"auto_vacuum {auto_vacuum}, free pages {freelist}"
+)
+db.close()
@@ -1,64 +1,314 @@
 import time
 import re
+import os
+import sys
+import json
 import pyperclip
 import requests
 import argparse
+from requests.adapters import HTTPAdapter
 
-# Bilibili, Douyin, TikTok, X (Twitter) simple regexes
-SUPPORTED_DOMAINS_PATTERN = re.compile(r'(bilibili\.com|douyin\.com|tiktok\.com|x\.com|twitter\.com)')
 URL_PATTERN = re.compile(r'(https?://[^\s]+)')
 
 API_BASE_URL = "http://127.0.0.1:8000/api/v1"
 
-def extract_url(text):
-    match = URL_PATTERN.search(text)
-    if match:
-        return match.group(1)
-    return None
+# Used until the server's /video/platforms list has been fetched (e.g. backend offline at startup)
+DEFAULT_DOMAINS = ["bilibili.com", "b23.tv", "douyin.com", "tiktok.com", "x.com", "twitter.com"]
+
+DEFAULT_SPOOL_FILE = os.path.join(os.path.expanduser("~"), ".accio_watcher_spool.json")
+
+POLL_INTERVAL = 0.2          # seconds between clipboard change counter checks
+FALLBACK_POLL_INTERVAL = 1.0 # seconds between clipboard reads when no change counter is available
+FLUSH_INTERVAL = 1.0         # seconds to collect URLs before submitting them as one batch
+SEEN_TTL = 3600              # seconds before the same URL may be submitted again
+DOMAINS_REFRESH = 600        # seconds between /video/platforms refreshes
+BACKOFF_BASE = 2             # seconds, doubled per failed attempt
+BACKOFF_MAX = 300
+MAX_BATCH = 20               # must not exceed the server's MAX_BATCH_URLS
+
+
+def extract_urls(text):
+    return URL_PATTERN.findall(text or "")
+
+
+def build_domain_pattern(domains):
+    # Match on the host only, so "x.com" does not match "box.com" or a path segment
+    escaped = sorted((re.escape(d.lower()) for d in domains), key=len, reverse=True)
+    return re.compile(r'(?:^|\.)(?:' + "|".join(escaped) + r')(?::\d+)?$')
+
+
+def is_supported(url, domain_pattern):
+    host = url.split("://", 1)[-1].split("/", 1)[0].lower()
+    return bool(domain_pattern.search(host))
+
+
+class ClipboardMonitor:
+    """
+    Reports clipboard text only when it changes. Uses the OS change counter
+    where available (Windows sequence number, macOS NSPasteboard changeCount)
+    so the clipboard is only read after a copy; otherwise falls back to
+    comparing pasted content.
+    """
+
+    def __init__(self):
+        self._last_token = None
+        self._last_text = None
+        self._token_fn = self._detect_change_counter()
+
+    @staticmethod
+    def _detect_change_counter():
+        if sys.platform == "win32":
+            try:
+                import ctypes
+                return ctypes.windll.user32.GetClipboardSequenceNumber
+            except Exception:
+                return None
+        if sys.platform == "darwin":
+            try:
+                from AppKit import NSPasteboard
+                pasteboard = NSPasteboard.generalPasteboard()
+                return pasteboard.changeCount
+            except ImportError:
+                return None
+        return None
+
+    @property
+    def event_driven(self):
+        return self._token_fn is not None
+
+    def poll(self):
+        """Return the new clipboard text, or None if nothing changed."""
+        if self._token_fn is not None:
+            token = self._token_fn()
+            if token == self._last_token:
+                return None
+            self._last_token = token
+
+        text = pyperclip.paste()
+        if text == self._last_text:
+            return None
+        self._last_text = text
+        return text
+
+
+class SeenCache:
+    """URLs already queued, forgotten after ttl seconds."""
+
+    def __init__(self, ttl=SEEN_TTL):
+        self.ttl = ttl
+        self._expires = {}
+
+    def add(self, url):
+        self._expires[url] = time.time() + self.ttl
+
+    def __contains__(self, url):
+        expiry = self._expires.get(url)
+        if expiry is None:
+            return False
+        if expiry < time.time():
+            del self._expires[url]
+            return False
+        return True
+
+    def prune(self):
+        now = time.time()
+        self._expires = {u: e for u, e in self._expires.items() if e >= now}
+
+
+class SpoolQueue:
+    """On-disk queue of pending submissions so nothing is lost while the backend is down."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[Warn] Could not read spool file {path}: {e}")
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def urls(self):
+        return [e["url"] for e in self.entries]
+
+    def push(self, urls):
+        now = time.time()
+        queued = set(self.urls())
+        for url in urls:
+            if url in queued:
+                continue
+            self.entries.append({"url": url, "attempts": 0, "next_try": now + FLUSH_INTERVAL})
+        self._save()
+
+    def due(self, limit=MAX_BATCH):
+        now = time.time()
+        return [e for e in self.entries if e["next_try"] <= now][:limit]
+
+    def remove(self, entries):
+        done = {id(e) for e in entries}
+        self.entries = [e for e in self.entries if id(e) not in done]
+        self._save()
+
+    def retry_later(self, entries):
+        now = time.time()
+        for e in entries:
+            e["attempts"] += 1
+            e["next_try"] = now + min(BACKOFF_BASE * (2 ** (e["attempts"] - 1)), BACKOFF_MAX)
+        self._save()
+
+
+class AccioClient:
+    def __init__(self, base_url, action):
+        self.base_url = base_url.rstrip("/")
+        self.action = action
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.batch_supported = True
+
+    def fetch_domains(self):
+        response = self.session.get(f"{self.base_url}/video/platforms", timeout=5)
+        response.raise_for_status()
+        return list(response.json().keys())
+
+    def submit(self, urls):
+        """
+        Submit URLs and return a dict of url -> (outcome, detail), where outcome is
+        "accepted" (detail = task id), "rejected" (4xx, not retryable) or
+        "failed" (network/server error, retry later).
+        """
+        if self.batch_supported:
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/video/download/batch",
+                    json={"urls": urls, "action": self.action, "format_id": "best"},
+                    timeout=15,
+                )
+            except requests.RequestException as e:
+                return {url: ("failed", str(e)) for url in urls}
+
+            if response.status_code in (404, 405):
+                # Older backend without the batch endpoint
+                self.batch_supported = False
+            elif response.status_code >= 500:
+                return {url: ("failed", f"Status: {response.status_code}") for url in urls}
+            elif response.status_code == 200:
+                # The batch is created in one transaction, so tasks come back in request order
+                try:
+                    tasks = response.json()
+                except ValueError:
+                    tasks = None
+                if not isinstance(tasks, list) or len(tasks) != len(urls):
+                    return {url: ("failed", f"Unexpected batch response: {response.text[:200]}") for url in urls}
+                return {url: ("accepted", t.get("task_id")) for url, t in zip(urls, tasks)}
+            # Any other 4xx: submit one by one so only the offending URLs are rejected
+
+        results = {}
+        for i, url in enumerate(urls):
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/video/download",
+                    json={"url": url, "action": self.action, "format_id": "best"},
+                    timeout=15,
+                )
+            except requests.RequestException as e:
+                # Backend unreachable: don't try the rest of the batch now
+                for pending in urls[i:]:
+                    results[pending] = ("failed", str(e))
+                break
+
+            if response.status_code >= 500:
+                results[url] = ("failed", f"Status: {response.status_code}, Msg: {response.text}")
+            elif response.status_code != 200:
+                results[url] = ("rejected", f"Status: {response.status_code}, Msg: {response.text}")
+            else:
+                try:
+                    results[url] = ("accepted", response.json().get("task_id"))
+                except (ValueError, AttributeError):
+                    results[url] = ("failed", f"Unexpected response: {response.text[:200]}")
+        return results
 
-def is_supported(url):
-    return bool(SUPPORTED_DOMAINS_PATTERN.search(url))
 
 def main():
     parser = argparse.ArgumentParser(description="Accio PC Clipboard Watcher")
     parser.add_argument("--action", type=str, choices=["local", "webdav"], default="webdav", help="Target action for downloads")
+    parser.add_argument("--api", type=str, default=API_BASE_URL, help="Backend API base URL")
+    parser.add_argument("--spool", type=str, default=DEFAULT_SPOOL_FILE, help="File used to queue URLs while the backend is unreachable")
     args = parser.parse_args()
 
+    client = AccioClient(args.api, args.action)
+    monitor = ClipboardMonitor()
+    seen = SeenCache()
+    spool = SpoolQueue(args.spool)
+    for url in spool.urls():
+        seen.add(url)
+
+    domain_pattern = build_domain_pattern(DEFAULT_DOMAINS)
+    domains_fetched_at = 0.0
+
     print("Starting PC Clipboard Watcher for Accio-Downloader...")
     print(f"Action configured: {args.action}")
-    print("Listening for Bilibili, Douyin, TikTok, and X links...")
-    
-    last_processed_url = ""
+    poll_interval = POLL_INTERVAL if monitor.event_driven else FALLBACK_POLL_INTERVAL
+    print(f"Clipboard detection: {'change counter' if monitor.event_driven else 'content polling'}")
+    if spool.entries:
+        print(f"[*] Resuming {len(spool.entries)} spooled URL(s) from {args.spool}")
 
     while True:
         try:
-            current_clipboard = pyperclip.paste()
-            if current_clipboard:
-                url = extract_url(current_clipboard)
-                
-                # Check if it's a valid and supported URL we haven't seen yet
-                if url and url != last_processed_url and is_supported(url):
-                    print(f"\n[+] Detected supported URL: {url}")
-                    
-                    try:
-                        # Send download start request directly
-                        download_url = f"{API_BASE_URL}/video/download"
-                        payload = {"url": url, "action": args.action, "format_id": "best"}
-                        print(f"[*] Dispatching background download task to {download_url}...")
-                        response = requests.post(download_url, json=payload, timeout=15)
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            print(f"[Success] Task submitted successfully! Task ID: {data.get('task_id')}")
-                            # Update last processed on success to avoid infinite loop
-                            last_processed_url = url
-                        else:
-                            print(f"[Error] Failed to initiate task. Status: {response.status_code}, Msg: {response.text}")
-                    except requests.RequestException as e:
-                        print(f"[Error] Could not reach backend API: {e}")
+            now = time.time()
+            if now - domains_fetched_at >= DOMAINS_REFRESH:
+                domains_fetched_at = now
+                seen.prune()
+                try:
+                    domain_pattern = build_domain_pattern(client.fetch_domains())
+                except (requests.RequestException, ValueError) as e:
+                    print(f"[Warn] Could not fetch supported platforms, using cached list: {e}")
+
+            text = monitor.poll()
+            if text:
+                new_urls = [
+                    u for u in dict.fromkeys(extract_urls(text))
+                    if is_supported(u, domain_pattern) and u not in seen
+                ]
+                if new_urls:
+                    for url in new_urls:
+                        print(f"\n[+] Detected supported URL: {url}")
+                        seen.add(url)
+                    spool.push(new_urls)
+
+            batch = spool.due()
+            if batch:
+                urls = list(dict.fromkeys(e["url"] for e in batch))
+                print(f"[*] Dispatching {len(urls)} URL(s) to {client.base_url}...")
+                results = client.submit(urls)
+                done, failed = [], []
+                for entry in batch:
+                    outcome, detail = results.get(entry["url"], ("failed", "no result"))
+                    if outcome == "accepted":
+                        print(f"[Success] Task submitted successfully! Task ID: {detail} ({entry['url']})")
+                        done.append(entry)
+                    elif outcome == "rejected":
+                        print(f"[Error] Backend rejected {entry['url']}, dropping it. {detail}")
+                        done.append(entry)
+                    else:
+                        failed.append(entry)
+                if done:
+                    spool.remove(done)
+                if failed:
+                    spool.retry_later(failed)
+                    wait = min(entry["next_try"] for entry in failed) - time.time()
+                    reason = results.get(failed[0]["url"], ("failed", "no result"))[1]
+                    print(f"[Error] Could not submit {len(failed)} URL(s), retrying in {wait:.0f}s: {reason}")
+
+            time.sleep(poll_interval)
 
-            time.sleep(1)
-            
         except pyperclip.PyperclipException as e:
             print(f"Clipboard read error: {e}")
             time.sleep(1)
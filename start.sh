@@ -14,6 +14,7 @@ mkdir -p /data
 export DATABASE_URL="${DATABASE_URL:-sqlite:////data/sql_app.db}"
 export COOKIES_FILE="${COOKIES_FILE:-/data/cookies.txt}"
 export TEMP_DOWNLOAD_DIR="${TEMP_DOWNLOAD_DIR:-/data/downloads}"
+export PROFILE_DIR="${PROFILE_DIR:-/data/profiles}"
 export CORS_ORIGINS="${CORS_ORIGINS:-http://localhost:8080}"
 
 echo ">>> Starting FastAPI backend on :8000..."
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.models.base import Base, Task, TaskStatus, ArchivedTask
+from app.services import archiver
+from app.services.archiver import archive_old_tasks, optimize_sqlite
+
+
+def test_archive_old_tasks():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    old = datetime.utcnow() - timedelta(days=60)
+    recent = datetime.utcnow() - timedelta(days=1)
+    db.add_all([
+        Task(id="old-done", url="u1", status=TaskStatus.COMPLETED, percent=100, created_at=old),
+        Task(id="old-failed", url="u2", status=TaskStatus.FAILED, error_msg="boom", created_at=old),
+        Task(id="old-pending", url="u3", status=TaskStatus.PENDING, created_at=old),
+        Task(id="old-downloading", url="u4", status=TaskStatus.DOWNLOADING, created_at=old),
+        Task(id="recent-done", url="u5", status=TaskStatus.COMPLETED, created_at=recent),
+    ])
+    db.commit()
+
+    assert archive_old_tasks(db, older_than_days=30) == 2
+
+    remaining = {t.id for t in db.query(Task).all()}
+    assert remaining == {"old-pending", "old-downloading", "recent-done"}
+
+    archived = {t.id: t for t in db.query(ArchivedTask).all()}
+    assert set(archived) == {"old-done", "old-failed"}
+    assert archived["old-failed"].error_msg == "boom"
+    assert archived["old-done"].archived_at is not None
+    db.close()
+
+
+def test_optimize_sqlite_reclaims_free_pages(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'vacuum.db'}")
+    monkeypatch.setattr(archiver, "engine", engine)
+    monkeypatch.setattr(archiver.settings, "DATABASE_URL", str(engine.url))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        conn.execute(text("CREATE TABLE blobs (data BLOB)"))
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000) "
+            "INSERT INTO blobs SELECT randomblob(4000) FROM n"
+        ))
+        conn.execute(text("DELETE FROM blobs"))
+        free_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+
+    optimize_sqlite()
+
+    with engine.connect() as conn:
+        free_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+    assert free_before > 1000
+    assert free_after == 0
@@ -0,0 +1,67 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.main import app
+from app.api.dependencies import get_db
+from app.api.endpoints import video
+from app.models.base import Base, Task
+from app.schemas.video_schema import MAX_BATCH_URLS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    TestSession = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    scheduled = []
+    monkeypatch.setattr(video, "run_download_task", lambda task_id, url: scheduled.append((task_id, url)))
+    app.dependency_overrides[get_db] = override_get_db
+    c = TestClient(app)
+    c.session_factory = TestSession
+    c.scheduled = scheduled
+    yield c
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_batch_returns_tasks_in_request_order(client):
+    urls = [f"https://www.bilibili.com/video/BV{i}" for i in range(5)]
+    response = client.post("/api/v1/video/download/batch", json={"urls": urls})
+    assert response.status_code == 200
+
+    task_ids = [t["task_id"] for t in response.json()]
+    db = client.session_factory()
+    assert [db.get(Task, tid).url for tid in task_ids] == urls
+    db.close()
+    assert [url for _, url in client.scheduled] == urls
+
+
+def test_batch_dedupes_and_strips_share_text(client):
+    response = client.post("/api/v1/video/download/batch", json={"urls": [
+        "https://b23.tv/a",
+        "Check this out https://b23.tv/a",
+        "https://b23.tv/b",
+    ]})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert [url for _, url in client.scheduled] == ["https://b23.tv/a", "https://b23.tv/b"]
+
+
+def test_batch_rejects_too_many_urls(client):
+    urls = [f"https://b23.tv/{i}" for i in range(MAX_BATCH_URLS + 1)]
+    assert client.post("/api/v1/video/download/batch", json={"urls": urls}).status_code == 422
+    assert client.scheduled == []
+
+
+@pytest.mark.parametrize("urls", [[], ["not a url"]])
+def test_batch_rejects_empty_list(client, urls):
+    assert client.post("/api/v1/video/download/batch", json={"urls": urls}).status_code == 422
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import pytest
+import requests
+
+pytest.importorskip("pyperclip")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "clients"))
+import pc_watcher  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text=None):
+        self.status_code = status_code
+        self._body = body
+        self.text = text if text is not None else str(body)
+
+    def json(self):
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.posted = []
+
+    def post(self, url, json, timeout):
+        self.posted.append((url, json))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_client(responses):
+    client = pc_watcher.AccioClient("http://backend/api/v1", "local")
+    client.session = FakeSession(responses)
+    return client
+
+
+def test_domain_pattern_matches_host_only():
+    pattern = pc_watcher.build_domain_pattern(["x.com", "bilibili.com", "b23.tv"])
+    assert pc_watcher.is_supported("https://x.com/user/status/1", pattern)
+    assert pc_watcher.is_supported("https://www.bilibili.com/video/BV1", pattern)
+    assert pc_watcher.is_supported("https://b23.tv:443/abc", pattern)
+    assert not pc_watcher.is_supported("https://box.com/file", pattern)
+    assert not pc_watcher.is_supported("https://example.com/x.com", pattern)
+
+
+def test_spool_retry_later_backoff(tmp_path):
+    spool = pc_watcher.SpoolQueue(str(tmp_path / "spool.json"))
+    spool.push(["https://x.com/1"])
+    entry = spool.entries[0]
+
+    delays = []
+    for _ in range(10):
+        before = time.time()
+        spool.retry_later([entry])
+        delays.append(round(entry["next_try"] - before))
+
+    assert delays == [2, 4, 8, 16, 32, 64, 128, 256, 300, 300]
+    # The schedule survives a restart
+    assert pc_watcher.SpoolQueue(str(tmp_path / "spool.json")).entries[0]["attempts"] == 10
+
+
+def test_spool_push_skips_queued_urls(tmp_path):
+    spool = pc_watcher.SpoolQueue(str(tmp_path / "spool.json"))
+    spool.push(["https://x.com/1", "https://x.com/2"])
+    spool.push(["https://x.com/2", "https://x.com/3"])
+    assert spool.urls() == ["https://x.com/1", "https://x.com/2", "https://x.com/3"]
+
+
+def test_seen_cache_ttl():
+    seen = pc_watcher.SeenCache(ttl=-1)
+    seen.add("https://x.com/1")
+    assert "https://x.com/1" not in seen
+
+
+def test_submit_batch_maps_task_ids_in_order():
+    client = make_client([FakeResponse(200, [{"task_id": "t1"}, {"task_id": "t2"}])])
+    assert client.submit(["u1", "u2"]) == {"u1": ("accepted", "t1"), "u2": ("accepted", "t2")}
+
+
+@pytest.mark.parametrize("response", [
+    FakeResponse(200, [{"task_id": "t1"}]),
+    FakeResponse(200, ValueError("not json"), text="<html>"),
+    FakeResponse(502, text="bad gateway"),
+    requests.ConnectionError("down"),
+])
+def test_submit_batch_failures_are_retryable(response):
+    client = make_client([response])
+    results = client.submit(["u1", "u2"])
+    assert {outcome for outcome, _ in results.values()} == {"failed"}
+    assert set(results) == {"u1", "u2"}
+
+
+def test_submit_per_url_fallback_results():
+    client = make_client([
+        FakeResponse(404, text="not found"),          # batch endpoint missing
+        FakeResponse(200, {"task_id": "t1"}),
+        FakeResponse(422, text="bad url"),
+        FakeResponse(500, text="boom"),
+        FakeResponse(200, ValueError("not json"), text="<html>"),
+        requests.ConnectionError("down"),
+    ])
+    results = client.submit(["u1", "u2", "u3", "u4", "u5", "u6"])
+
+    assert results["u1"] == ("accepted", "t1")
+    assert results["u2"][0] == "rejected"
+    assert results["u3"][0] == "failed"
+    assert results["u4"][0] == "failed"
+    assert results["u5"][0] == "failed"
+    assert results["u6"][0] == "failed"
+    assert not client.batch_supported
@@ -0,0 +1,96 @@
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import profiler
+
+
+@pytest.fixture(autouse=True)
+def isolated_profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "_rules", [])
+    monkeypatch.setattr(profiler.settings, "PROFILE_DIR", str(tmp_path))
+
+
+def test_match_rule_by_task_and_platform():
+    profiler.add_rule(task_id="task-1")
+    profiler.add_rule(platform="Bilibili")
+
+    assert profiler._match_rule("task-1", "https://youtube.com/watch?v=1")["task_id"] == "task-1"
+    assert profiler._match_rule("task-2", "https://www.bilibili.com/video/BV1")["platform"] == "bilibili"
+    assert profiler._match_rule("task-2", "https://youtube.com/watch?v=1") is None
+    assert profiler._match_rule(None, None) is None
+
+
+def test_match_rule_max_runs_removes_rule():
+    rule = profiler.add_rule(platform="bilibili", max_runs=2)
+    url = "https://www.bilibili.com/video/BV1"
+
+    assert profiler._match_rule(None, url) is rule
+    assert rule in profiler.list_rules()
+    assert profiler._match_rule(None, url) is rule
+    assert rule["runs"] == 2
+    assert profiler.list_rules() == []
+    assert profiler._match_rule(None, url) is None
+
+
+def test_match_rule_expires():
+    rule = profiler.add_rule(platform="bilibili", duration_seconds=60)
+    assert rule["until"] > time.time()
+    rule["until"] = time.time() - 1
+
+    assert profiler._match_rule(None, "https://www.bilibili.com/video/BV1") is None
+    assert profiler.list_rules() == []
+
+
+def test_rule_defaults_bound_cost():
+    rule = profiler.add_rule(platform="bilibili")
+    assert rule["max_runs"] == profiler.settings.PROFILE_RULE_DEFAULT_RUNS
+    assert rule["until"] == pytest.approx(time.time() + profiler.settings.PROFILE_RULE_DEFAULT_SECONDS, abs=5)
+
+
+def test_profile_writes_artifacts():
+    profiler.add_rule(task_id="task-1")
+    with profiler.profile("download", task_id="task-1", url="https://b23.tv/x"):
+        sum(i * i for i in range(200000))
+
+    [meta] = profiler.list_profiles()
+    assert meta["task_id"] == "task-1" and meta["section"] == "download"
+    for ext in profiler.PROFILE_EXTENSIONS:
+        assert profiler.get_profile_path(meta["id"], ext)
+
+
+def test_prune_profiles_keeps_newest(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler.settings, "PROFILE_MAX_STORED", 2)
+    for i in range(4):
+        profile_id = f"2026010{i}-000000-download-t{i}"
+        (tmp_path / f"{profile_id}.json").write_text(json.dumps({"id": profile_id, "started_at": f"2026-01-0{i + 1}T00:00:00"}))
+        (tmp_path / f"{profile_id}.collapsed").write_text("main 1\n")
+
+    profiler._prune_profiles()
+
+    assert [m["id"] for m in profiler.list_profiles()] == ["20260103-000000-download-t3", "20260102-000000-download-t2"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "20260102-000000-download-t2.collapsed", "20260102-000000-download-t2.json",
+        "20260103-000000-download-t3.collapsed", "20260103-000000-download-t3.json",
+    ]
+
+
+@pytest.mark.parametrize("profile_id", ["../x", "..", "a/b", ""])
+def test_get_profile_path_rejects_traversal(tmp_path, profile_id):
+    (tmp_path.parent / "x.json").write_text("{}")
+    assert profiler.get_profile_path(profile_id, "json") is None
+
+
+def test_require_admin(monkeypatch):
+    client = TestClient(app)
+    url = "/api/v1/admin/profiling/rules"
+
+    monkeypatch.setattr(profiler.settings, "ADMIN_TOKEN", "")
+    assert client.get(url, headers={"X-Admin-Token": "anything"}).status_code == 403
+
+    monkeypatch.setattr(profiler.settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.get(url, headers={"X-Admin-Token": "ключ".encode()}).status_code == 401
+    assert client.get(url, headers={"X-Admin-Token": "s3cret"}).status_code == 200